@@ -1,32 +1,136 @@
+from __future__ import annotations
+
+import io
 import os 
 import sys
-import frida
+import socket
+import shlex
+import posixpath
 import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
 import shutil
 import argparse
-import paramiko
-from scp import SCPClient
-from tqdm import tqdm
 import logging
-import zipfile
 import stat
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Set, TYPE_CHECKING
 from dataclasses import dataclass
 import time
 import textwrap
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("runtime.log","w", "utf-8"),
-        logging.StreamHandler()
-    ]
-)
+# frida, paramiko, tqdm and zipfile are imported where first used so that --help and
+# argument errors return without paying their import cost
+if TYPE_CHECKING:
+    import frida
+    import paramiko
+    import zipfile
 
 logger = logging.getLogger(__name__)
 
+TRANSFER_CHUNK_SIZE = 1024 * 1024
+SSH_WINDOW_SIZE = 2147483647
+SSH_MAX_PACKET_SIZE = 32768
+SOCKET_BUFFER_SIZE = 32 * 1024 * 1024
+MAX_TRANSFER_WORKERS = 8
+SFTP_MAX_REQUEST_SIZE = 65536
+SFTP_MAX_CONCURRENT_REQUESTS = 128
+DEVICE_TIMEOUT = 5
+SSH_KEEPALIVE_INTERVAL = 30
+# (option, value) pairs applied when the platform supports them
+TCP_KEEPALIVE_OPTIONS = (('TCP_KEEPIDLE', 30), ('TCP_KEEPINTVL', 10), ('TCP_KEEPCNT', 3))
+ZIP_COMPRESS_LEVEL = 1
+APP_SEPARATOR = '.app/'
+# Already compressed or low-redundancy binary content, not worth deflating
+STORED_EXTENSIONS = {
+    '.dylib', '.so', '.png', '.jpg', '.jpeg', '.mp4', '.mov', '.car', '.nib', '.otf', '.ttf'
+}
+
+def _split_app_path(path: str):
+    """Split a device path into its .app bundle name and the path relative to that bundle"""
+    index = path.find(APP_SEPARATOR)
+    if index < 0:
+        return None, None
+    return os.path.basename(path[:index + len(APP_SEPARATOR) - 1]), path[index + len(APP_SEPARATOR):]
+
+def _walk_files(root: str, prefix: str):
+    """Iteratively yield (absolute path, archive path) for every regular file below root"""
+    stack = [(root, prefix)]
+    while stack:
+        directory, rel_dir = stack.pop()
+        with os.scandir(directory) as it:
+            for entry in it:
+                rel_path = rel_dir + '/' + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, rel_path))
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path, rel_path
+
+_zlib = None
+
+def _get_zlib():
+    """Return zlib-ng's SIMD-accelerated, API-compatible zlib module when installed, else the stdlib one"""
+    global _zlib
+    if _zlib is None:
+        try:
+            from zlib_ng import zlib_ng as zlib
+        except ImportError:
+            import zlib
+        _zlib = zlib
+    return _zlib
+
+def _compress_entry(entry):
+    """
+    Deflate one IPA entry in a worker process, spilling the compressed data to a file
+    under temp_dir. Returns its ZipInfo and the spill file path.
+    """
+    import tempfile
+    import zipfile
+
+    zlib = _get_zlib()
+    file_path, arcname, temp_dir = entry
+    zip_info = zipfile.ZipInfo.from_file(file_path, arcname)
+    zip_info.compress_type = zipfile.ZIP_DEFLATED
+    compressor = zlib.compressobj(ZIP_COMPRESS_LEVEL, zlib.DEFLATED, -15)
+    crc = 0
+    size = 0
+    compress_size = 0
+    fd, spill_path = tempfile.mkstemp(dir=temp_dir)
+    with open(file_path, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+        while True:
+            data = src.read(TRANSFER_CHUNK_SIZE)
+            if not data:
+                break
+            crc = zlib.crc32(data, crc)
+            size += len(data)
+            data = compressor.compress(data)
+            dst.write(data)
+            compress_size += len(data)
+        data = compressor.flush()
+        dst.write(data)
+        compress_size += len(data)
+
+    zip_info.CRC = crc
+    zip_info.file_size = size
+    zip_info.compress_size = compress_size
+    return zip_info, spill_path
+
+def _write_compressed_entry(zipf: zipfile.ZipFile, zip_info: zipfile.ZipInfo, spill_path: str) -> None:
+    """Append an entry already compressed into spill_path to an open ZipFile, then remove the spill file"""
+    with zipf._lock:
+        if zipf._seekable:
+            zipf.fp.seek(zipf.start_dir)
+        zip_info.header_offset = zipf.fp.tell()
+        zipf._writecheck(zip_info)
+        zipf._didModify = True
+        zipf.fp.write(zip_info.FileHeader())
+        with open(spill_path, 'rb') as src:
+            shutil.copyfileobj(src, zipf.fp, TRANSFER_CHUNK_SIZE)
+        zipf.start_dir = zipf.fp.tell()
+        zipf.filelist.append(zip_info)
+        zipf.NameToInfo[zip_info.filename] = zip_info
+    os.remove(spill_path)
+
 @dataclass
 class SSHConfig:
     host: str
@@ -34,30 +138,81 @@ class SSHConfig:
     username: str = "root"
     password: Optional[str] = None
     key_filename: Optional[str] = None
+    compress: bool = True
 
     def __post_init__(self):
         if not self.password and not self.key_filename:
             raise ValueError("Either password or key_filename must be provided")
 
 class IpaBuilder:
-    def __init__(self, output_dir: Optional[str] = None) -> None:
+    def __init__(self, output_dir: Optional[str] = None, device_id: Optional[str] = None) -> None:
         self.script_dir = Path(__file__).parent
         self.dump_js = self.script_dir / 'res' / 'dump.js'
         self.output_dir = Path(output_dir or Path.home() / 'Downloads' / 'ios_dumps')
         self.payload_dir = self.output_dir / 'Payload'
+        self.device_id = device_id
         self.file_dict: Dict[str, str] = {}
+        self._created_dirs: Set[Path] = set()
         self.finished = threading.Event()
         self.ssh_client = None
         self.ssh_config = None
+        self._sock = None
+        self.ssh_lock = threading.Lock()
+        self._local = threading.local()
+        self._sftp_clients = []
+        self._pool = ThreadPoolExecutor(max_workers=MAX_TRANSFER_WORKERS)
+        self._futures = []
+        self.transfer_errors = []
+        self.progress_bar = None
+        self.progress_lock = threading.Lock()
 
     def connect_ssh(self, config: SSHConfig) -> None:
         """Establish SSH connection with retries and exponential backoff"""
         self.ssh_config = config
         self._create_ssh_connection()
 
+    def _open_socket(self) -> socket.socket:
+        """Open a TCP socket tuned for bulk transfers, trying every resolved address in turn"""
+        error = None
+        for family, socktype, proto, _, address in socket.getaddrinfo(
+            self.ssh_config.host, self.ssh_config.port, type=socket.SOCK_STREAM
+        ):
+            sock = socket.socket(family, socktype, proto)
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+                for option, value in TCP_KEEPALIVE_OPTIONS:
+                    if hasattr(socket, option):
+                        sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+                sock.connect(address)
+            except OSError as e:
+                sock.close()
+                error = e
+                continue
+            self._sock = sock
+            self._quickack()
+            return sock
+        raise error or OSError(f"Could not resolve {self.ssh_config.host}")
+
+    def _quickack(self) -> None:
+        """Re-arm TCP_QUICKACK (Linux only) so acks for incoming data are not delayed"""
+        if self._sock is not None and hasattr(socket, 'TCP_QUICKACK'):
+            try:
+                self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+            except OSError:
+                pass
+
     def _create_ssh_connection(self) -> None:
         """Create a new SSH connection"""
+        import paramiko
+
+        # paramiko splits SFTP reads into MAX_REQUEST_SIZE chunks; larger requests cut per-chunk overhead
+        paramiko.SFTPFile.MAX_REQUEST_SIZE = SFTP_MAX_REQUEST_SIZE
+
         try:
+            self._close_sftp_clients()
             if self.ssh_client:
                 self.ssh_client.close()
             
@@ -68,8 +223,14 @@ class IpaBuilder:
                 port=self.ssh_config.port,
                 username=self.ssh_config.username,
                 password=self.ssh_config.password,
-                key_filename=self.ssh_config.key_filename
+                key_filename=self.ssh_config.key_filename,
+                compress=self.ssh_config.compress,
+                sock=self._open_socket()
             )
+            transport = self.ssh_client.get_transport()
+            transport.default_window_size = SSH_WINDOW_SIZE
+            transport.default_max_packet_size = SSH_MAX_PACKET_SIZE
+            transport.set_keepalive(SSH_KEEPALIVE_INTERVAL)
             logger.info("SSH connection established successfully")
         except Exception as e:
             logger.error(f"SSH connection failed: {e}")
@@ -85,35 +246,155 @@ class IpaBuilder:
             logger.error(f"Error checking SSH connection: {e}")
             self._create_ssh_connection()
 
-    def _handle_dump_payload(self, payload: dict, progress_callback) -> None:
-        try:
+    def _get_sftp(self) -> paramiko.SFTPClient:
+        """Return the SFTP client owned by the calling worker thread"""
+        import paramiko
+
+        with self.ssh_lock:
             self._ensure_ssh_connection()
-            with SCPClient(self.ssh_client.get_transport(), progress=progress_callback) as scp:
-                try:
-                    scp.get(payload['dump'], str(self.payload_dir / ''))
-                    index = payload['path'].find('.app/')
-                    self.file_dict[Path(payload['dump']).name] = payload['path'][index + 5:]
-                except Exception as e:
-                    logger.error(f"Failed to transfer file: {e}")
-                    raise
-        except Exception as e:
-            logger.error(f"Failed to handle dump payload: {e}")
+            transport = self.ssh_client.get_transport()
+
+        sftp = getattr(self._local, 'sftp', None)
+        if sftp is None or sftp.get_channel().closed or sftp.get_channel().get_transport() is not transport:
+            sftp = paramiko.SFTPClient.from_transport(
+                transport,
+                window_size=SSH_WINDOW_SIZE,
+                max_packet_size=SSH_MAX_PACKET_SIZE
+            )
+            self._local.sftp = sftp
+            with self.ssh_lock:
+                self._sftp_clients.append(sftp)
+        return sftp
+
+    def _close_sftp_clients(self) -> None:
+        """Close the SFTP clients opened by worker threads"""
+        for sftp in self._sftp_clients:
+            try:
+                sftp.close()
+            except Exception:
+                pass
+        self._sftp_clients.clear()
+
+    def _sftp_get(self, sftp: paramiko.SFTPClient, remote_path: str, local_path: Path, progress_callback,
+                  size: Optional[int] = None) -> None:
+        """Download a single file over the given SFTP session"""
+        if size is None:
+            size = sftp.stat(remote_path).st_size
+        progress_callback(remote_path, size, 0)
+        with sftp.open(remote_path, 'rb') as remote_file, open(local_path, 'wb') as local_file:
+            remote_file.prefetch(size, max_concurrent_requests=SFTP_MAX_CONCURRENT_REQUESTS)
+            self._copy_stream(remote_file, local_file, remote_path, size, progress_callback)
+
+    def _copy_stream(self, src, dst, name: str, size: int, progress_callback) -> None:
+        """Copy a file object in TRANSFER_CHUNK_SIZE blocks, reporting progress as it goes"""
+        sent = 0
+        if isinstance(src, io.IOBase):
+            # Real readinto (e.g. tar members) fills the calling thread's reused buffer without allocating
+            view = getattr(self._local, 'copy_buffer', None)
+            if view is None:
+                view = self._local.copy_buffer = memoryview(bytearray(TRANSFER_CHUNK_SIZE))
+            read = lambda: view[:src.readinto(view)]
+        else:
+            # paramiko's readinto is read() plus a copy, so use read() directly
+            read = lambda: src.read(TRANSFER_CHUNK_SIZE)
+        while True:
+            data = read()
+            if not data:
+                break
+            dst.write(data)
+            self._quickack()
+            sent += len(data)
+            progress_callback(name, size, sent)
+
+    def _sftp_get_tree(self, sftp: paramiko.SFTPClient, remote_dir: str, local_dir: Path, progress_callback,
+                       skip: Optional[set] = None) -> None:
+        """Recursively download a directory over the given SFTP session, leaving paths in skip untouched"""
+        self._ensure_dir(local_dir)
+        for entry in sftp.listdir_attr(remote_dir):
+            remote_path = f"{remote_dir}/{entry.filename}"
+            local_path = local_dir / entry.filename
+            if skip and local_path in skip:
+                continue
+            attr = entry
+            if stat.S_ISLNK(attr.st_mode):
+                attr = sftp.stat(remote_path)
+            if stat.S_ISDIR(attr.st_mode):
+                self._sftp_get_tree(sftp, remote_path, local_path, progress_callback, skip)
+            elif stat.S_ISREG(attr.st_mode):
+                self._sftp_get(sftp, remote_path, local_path, progress_callback, attr.st_size)
+                os.chmod(local_path, stat.S_IMODE(attr.st_mode))
+
+    def _tar_get_tree(self, remote_dir: str, local_dir: Path, progress_callback, skip: Optional[set] = None) -> bool:
+        """
+        Stream a directory from the device as a single tar archive over an exec channel,
+        leaving paths in skip untouched. Returns False if the device could not produce the complete archive.
+        """
+        import tarfile
+        import paramiko
 
-    def _handle_app_payload(self, payload: dict, progress_callback) -> None:
-        try:
+        with self.ssh_lock:
             self._ensure_ssh_connection()
-            with SCPClient(self.ssh_client.get_transport(), progress=progress_callback) as scp:
-                try:
-                    scp.get(payload['app'], str(self.payload_dir / ''), recursive=True)
-                    self.file_dict['app'] = Path(payload['app']).name
-                except Exception as e:
-                    logger.error(f"Failed to transfer app: {e}")
-                    raise
-        except Exception as e:
-            logger.error(f"Failed to handle app payload: {e}")
+            transport = self.ssh_client.get_transport()
+
+        parent, name = posixpath.split(remote_dir.rstrip('/'))
+        channel = None
+        try:
+            channel = transport.open_session(window_size=SSH_WINDOW_SIZE, max_packet_size=SSH_MAX_PACKET_SIZE)
+            # -h follows symlinks, matching the SFTP fallback and the former scp -r
+            channel.exec_command(f"tar -chf - -C {shlex.quote(parent)} {shlex.quote(name)}")
+            with tarfile.open(fileobj=channel.makefile('rb', TRANSFER_CHUNK_SIZE), mode='r|') as tar:
+                for member in tar:
+                    member_name = posixpath.normpath(member.name)
+                    if not self._in_bundle(member_name, name):
+                        logger.warning(f"Skipping unexpected tar entry: {member.name}")
+                        continue
+
+                    local_path = local_dir.parent / member_name
+                    if skip and local_path in skip:
+                        continue
+                    if member.isdir():
+                        self._ensure_dir(local_path)
+                    elif member.isfile():
+                        self._ensure_dir(local_path.parent)
+                        progress_callback(member.name, member.size, 0)
+                        with tar.extractfile(member) as src, open(local_path, 'wb') as dst:
+                            self._copy_stream(src, dst, member.name, member.size, progress_callback)
+                        os.chmod(local_path, stat.S_IMODE(member.mode))
+                    elif member.islnk():
+                        link_name = posixpath.normpath(member.linkname)
+                        link_path = local_dir.parent / link_name
+                        if not self._in_bundle(link_name, name) or not link_path.is_file():
+                            logger.warning(f"Skipping unexpected tar entry: {member.name} -> {member.linkname}")
+                            continue
+                        self._ensure_dir(local_path.parent)
+                        shutil.copyfile(link_path, local_path)
+                        os.chmod(local_path, stat.S_IMODE(member.mode))
+                    else:
+                        logger.warning(f"Skipping unsupported tar entry: {member.name}")
+
+            status = channel.recv_exit_status()
+            errors = channel.makefile_stderr('rb').read().decode('utf-8', 'replace').strip()
+        except (tarfile.ReadError, paramiko.SSHException) as e:
+            logger.warning(f"Streaming app bundle with tar failed ({e}), falling back to SFTP")
+            return False
+        finally:
+            if channel:
+                channel.close()
+
+        if status != 0:
+            logger.warning(f"tar exited with status {status} ({errors or 'no output'}), falling back to SFTP")
+            return False
+        return True
+
+    @staticmethod
+    def _in_bundle(archive_path: str, name: str) -> bool:
+        """Check that a normalized tar path stays inside the bundle directory called name"""
+        return archive_path == name or archive_path.startswith(name + '/')
 
     def __del__(self):
-        """Cleanup SSH connection"""
+        """Cleanup worker pool, SFTP clients and SSH connection"""
+        self._pool.shutdown(wait=False)
+        self._close_sftp_clients()
         if self.ssh_client:
             try:
                 self.ssh_client.close()
@@ -122,43 +403,45 @@ class IpaBuilder:
 
     def get_usb_iphone(self) -> frida.core.Device:
         """
-        Retrieve the USB-connected iPhone. If multiple devices are connected,
-        allow the user to select one. Automatically selects the device if only one is found.
+        Retrieve the USB-connected iPhone. Uses the device given by --device-id if set, otherwise
+        waits for a USB device and, if multiple devices are connected, allows the user to select one.
+        Automatically selects the device if only one is found.
         """
-        for attempt in range(3):
+        import frida
+
+        try:
+            if self.device_id:
+                device = frida.get_device(self.device_id, timeout=DEVICE_TIMEOUT)
+                logger.info(f"Using device: {device.name}")
+                return device
+
+            manager = frida.get_device_manager()
+            matched = manager.get_device_matching(lambda device: device.type == 'usb', timeout=DEVICE_TIMEOUT)
+            # The matched device may have detached again before enumeration
+            usb_devices = [device for device in manager.enumerate_devices() if device.type == 'usb'] or [matched]
+        except frida.InvalidArgumentError as e:
+            logger.error(f"Failed to detect an iPhone: {e}")
+            raise RuntimeError("No iPhone detected")
+
+        if len(usb_devices) == 1:
+            logger.info(f"One iPhone detected: {usb_devices[0].name}")
+            return usb_devices[0]
+
+        logger.info("Multiple devices detected. Please select one:")
+        for idx, device in enumerate(usb_devices, start=1):
+            print(f"{idx}. {device.name} (ID: {device.id})")
+
+        while True:
             try:
-                devices = frida.get_device_manager().enumerate_devices()
-                usb_devices = [device for device in devices if device.type == 'usb']
-                
-                if not usb_devices:
-                    logger.warning(f"No iPhone connected via USB. Attempt {attempt + 1}/3")
-                    time.sleep(1)
-                    continue
-                
-                if len(usb_devices) == 1:
-                    logger.info(f"One iPhone detected: {usb_devices[0].name}")
-                    return usb_devices[0]
-                
-                logger.info("Multiple devices detected. Please select one:")
-                for idx, device in enumerate(usb_devices, start=1):
-                    print(f"{idx}. {device.name} (ID: {device.id})")
-                
-                while True:
-                    try:
-                        choice = int(input("Enter the number of the device you want to use: "))
-                        if 1 <= choice <= len(usb_devices):
-                            selected_device = usb_devices[choice - 1]
-                            logger.info(f"Selected device: {selected_device.name}")
-                            return selected_device
-                        else:
-                            print("Invalid choice. Please try again.")
-                    except ValueError:
-                        print("Invalid input. Please enter a number.")
-            except Exception as e:
-                logger.error(f"Error while detecting devices: {e}")
-        
-        logger.error("Failed to detect an iPhone after multiple attempts.")
-        raise RuntimeError("No iPhone detected")
+                choice = int(input("Enter the number of the device you want to use: "))
+                if 1 <= choice <= len(usb_devices):
+                    selected_device = usb_devices[choice - 1]
+                    logger.info(f"Selected device: {selected_device.name}")
+                    return selected_device
+                else:
+                    print("Invalid choice. Please try again.")
+            except ValueError:
+                print("Invalid input. Please enter a number.")
 
     def create_directories(self) -> None:
         """Create necessary directories"""
@@ -166,6 +449,13 @@ class IpaBuilder:
         if self.payload_dir.exists():
             shutil.rmtree(self.payload_dir, onerror=self._force_remove)
         self.payload_dir.mkdir(parents=True)
+        self._created_dirs = {self.payload_dir}
+
+    def _ensure_dir(self, path: Path) -> None:
+        """Create a local directory once, skipping the mkdir syscall for directories already created"""
+        if path not in self._created_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(path)
 
     def _force_remove(self, func, path, exc_info):
         """Force remove readonly files"""
@@ -186,45 +476,80 @@ class IpaBuilder:
             logger.info(f"[JavaScript Log] {log_message}")
             return
 
-        progress_bar = tqdm(unit='B', unit_scale=True, unit_divisor=1024, miniters=1)
-
-        def update_progress(filename, size, sent):
-            progress_bar.desc = Path(filename).name
-            progress_bar.total = size
-            progress_bar.update(sent - progress_bar.n)
-
         try:
-            if 'dump' in payload:
-                self._handle_dump_payload(payload, update_progress)
+            # A failed dumpModule sends dump: undefined, which JSON drops, leaving only 'path'
+            if 'dump' in payload or 'path' in payload:
+                if payload.get('dump'):
+                    app_name, rel_path = _split_app_path(payload['path'])
+                    if not rel_path:
+                        logger.error(f"Dumped module is outside the app bundle: {payload['path']}")
+                        return
+                    self.file_dict.setdefault('app', app_name)
+                    self.file_dict[os.path.basename(payload['dump'])] = rel_path
+                    self._futures.append(self._pool.submit(self._transfer, self._handle_dump_payload, payload))
+                else:
+                    logger.warning(f"Module was not dumped, keeping the original: {payload.get('path')}")
             elif 'app' in payload:
-                self._handle_app_payload(payload, update_progress)
+                # Failed dumps unregister themselves, so let them finish before deciding what the bundle copy skips
+                wait(self._futures)
+                self._futures.append(self._pool.submit(self._transfer, self._handle_app_payload, payload))
             elif 'done' in payload:
+                wait(self._futures)
+                self._futures.clear()
                 self.finished.set()
                 
         except Exception as e:
             logger.error(f"Error handling message: {e}")
-        finally:
-            progress_bar.close()
+
+    def _transfer(self, handler, payload: dict) -> None:
+        """Run a payload handler on a worker thread, reporting into the shared progress bar"""
+        last_sent = 0
+
+        def update_progress(filename, size, sent):
+            nonlocal last_sent
+            with self.progress_lock:
+                if sent == 0:
+                    last_sent = 0
+                    self.progress_bar.total = (self.progress_bar.total or 0) + size
+                    self.progress_bar.refresh()
+                self.progress_bar.update(sent - last_sent)
+            last_sent = sent
+
+        handler(payload, update_progress)
 
     def _handle_dump_payload(self, payload: dict, progress_callback) -> None:
-        with SCPClient(self.ssh_client.get_transport(), progress=progress_callback) as scp:
+        key = os.path.basename(payload['dump'])
+        target_path = self.payload_dir / self.file_dict['app'] / self.file_dict[key]
+        try:
+            sftp = self._get_sftp()
+            self._ensure_dir(target_path.parent)
+            self._sftp_get(sftp, payload['dump'], target_path, progress_callback)
+        except Exception as e:
+            logger.error(f"Failed to handle dump payload, keeping the original {self.file_dict[key]}: {e}")
+            # Unregister the module so the app bundle transfer copies the original in its place
             try:
-                scp.get(payload['dump'], str(self.payload_dir / ''))
-                index = payload['path'].find('.app/')
-                self.file_dict[Path(payload['dump']).name] = payload['path'][index + 5:]
-            except Exception as e:
-                logger.error(f"Failed to handle dump payload: {e}")
+                target_path.unlink()
+            except FileNotFoundError:
+                pass
+            del self.file_dict[key]
 
     def _handle_app_payload(self, payload: dict, progress_callback) -> None:
-        with SCPClient(self.ssh_client.get_transport(), progress=progress_callback) as scp:
-            try:
-                scp.get(payload['app'], str(self.payload_dir / ''), recursive=True)
-                self.file_dict['app'] = Path(payload['app']).name
-            except Exception as e:
-                logger.error(f"Failed to handle app payload: {e}")
+        try:
+            app_dir = self.payload_dir / Path(payload['app']).name
+            # Decrypted modules are already in place; don't overwrite them with the encrypted originals
+            dumped = {app_dir / value for key, value in self.file_dict.items() if key != 'app'}
+            if not self._tar_get_tree(payload['app'], app_dir, progress_callback, dumped):
+                self._sftp_get_tree(self._get_sftp(), payload['app'], app_dir, progress_callback, dumped)
+            self.file_dict['app'] = Path(payload['app']).name
+        except Exception as e:
+            logger.error(f"Failed to handle app payload: {e}")
+            self.transfer_errors.append(e)
 
     def generate_ipa(self, display_name: str) -> None:
         """Generate IPA file from dumped contents"""
+        import tempfile
+        import zipfile
+
         try:
             ipa_path = self.output_dir / f"{display_name}.ipa"
             logger.info(f'Generating IPA: {ipa_path}')
@@ -233,20 +558,33 @@ class IpaBuilder:
             if not app_name:
                 raise RuntimeError("App name not found in file dictionary.")
 
-            for key, value in self.file_dict.items():
-                if key != 'app':
-                    target_path = self.payload_dir / app_name / value
-                    target_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.move(self.payload_dir / key, target_path)
-
             app_folder = next(self.payload_dir.glob('*.app'), None)
             if not app_folder.exists() or not app_folder.is_dir():
                 raise RuntimeError(f"The .app folder '{app_folder}' does not exist or is not a directory.")
 
-            with zipfile.ZipFile(ipa_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for file_path in app_folder.rglob('*'):
-                    if file_path.is_file():
-                        zipf.write(file_path, file_path.relative_to(self.payload_dir.parent))
+            prefix = self.payload_dir.name + '/' + app_folder.name
+            # Dumped modules are Mach-O binaries, often without an extension
+            dumped = {prefix + '/' + value for key, value in self.file_dict.items() if key != 'app'}
+            max_workers = os.cpu_count() or 1
+            with tempfile.TemporaryDirectory(dir=self.output_dir) as temp_dir, \
+                    zipfile.ZipFile(ipa_path, 'w', allowZip64=True) as zipf, \
+                    ProcessPoolExecutor(max_workers=max_workers) as pool:
+                # Bound the entries in flight so workers can't spill far ahead of the single writer
+                pending = deque()
+                for abs_path, rel_path in _walk_files(str(app_folder), prefix):
+                    if os.path.splitext(rel_path)[1].lower() in STORED_EXTENSIONS or rel_path in dumped:
+                        # Stored entries gain nothing from the pool; stream them straight into the archive
+                        zip_info = zipfile.ZipInfo.from_file(abs_path, rel_path)
+                        zip_info.compress_type = zipfile.ZIP_STORED
+                        with open(abs_path, 'rb') as src, zipf.open(zip_info, 'w', force_zip64=True) as dst:
+                            shutil.copyfileobj(src, dst, TRANSFER_CHUNK_SIZE)
+                        continue
+
+                    pending.append(pool.submit(_compress_entry, (abs_path, rel_path, temp_dir)))
+                    if len(pending) >= max_workers * 2:
+                        _write_compressed_entry(zipf, *pending.popleft().result())
+                while pending:
+                    _write_compressed_entry(zipf, *pending.popleft().result())
 
             logger.info(f'IPA generated successfully: {ipa_path}')
         except Exception as e:
@@ -254,6 +592,8 @@ class IpaBuilder:
 
     def dump_app(self, app_identifier: str) -> bool:
         """Main method to dump the application"""
+        from tqdm import tqdm
+
         session = None
         success = False
         start_time = time.time()
@@ -294,11 +634,17 @@ class IpaBuilder:
                 script.load()
                 
                 logger.info("⏳ Dumping application contents...")
+                self.progress_bar = tqdm(unit='B', unit_scale=True, unit_divisor=1024, dynamic_ncols=True)
                 script.post('dump')
 
                 logger.info("⏳ Waiting for the dump to complete...\n***")
-                if not self.finished.wait(timeout=7200):
-                    raise TimeoutError("Dump operation timed out")
+                try:
+                    if not self.finished.wait(timeout=7200):
+                        raise TimeoutError("Dump operation timed out")
+                finally:
+                    self.progress_bar.close()
+                if self.transfer_errors:
+                    raise RuntimeError("Failed to transfer the app bundle")
                 logger.info("✅ Dump operation completed successfully")
                 session.detach()
 
@@ -394,6 +740,15 @@ def create_parser():
         '--key-file',
         help='Path to SSH private key file'
     )
+    ssh_group.add_argument(
+        '--device-id',
+        help='Frida device ID to use instead of detecting the USB device'
+    )
+    ssh_group.add_argument(
+        '--no-compression',
+        action='store_true',
+        help='Disable zlib compression of the SSH transport'
+    )
 
     output_group = parser.add_argument_group('Output Options')
     output_group.add_argument(
@@ -404,6 +759,15 @@ def create_parser():
     return parser
 
 def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("runtime.log","w", "utf-8"),
+            logging.StreamHandler()
+        ]
+    )
+
     parser = create_parser()
     args = parser.parse_args()
 
@@ -415,12 +779,13 @@ def main():
         port=args.port,
         username=args.user,
         password=args.password,
-        key_filename=args.key_file
+        key_filename=args.key_file,
+        compress=not args.no_compression
     )
 
     try:
         print("\n🚀 Starting iOS App Dumper...")
-        dumper = IpaBuilder(args.output)
+        dumper = IpaBuilder(args.output, args.device_id)
         logger.info("🔑 Establishing SSH connection...")
         dumper.connect_ssh(ssh_config)
         